@@ -36,6 +36,9 @@ class MqttConfig(SQLModel, table=True):
     subscribeTopicPattern: str = Field(default="override/#")
     subscribeQos: int = Field(default=1)
 
+    # Publishing (grouped: one JSON array per device on devices/<deviceId>/telemetry)
+    batchPublish: bool = Field(default=False)
+
     # Status
     enabled: bool = Field(default=True)
     connectionStatus: str = Field(default="disconnected")  # connected/connecting/disconnected
@@ -718,6 +718,12 @@ def settings_tab() -> rx.Component:
                             ),
                             spacing="4",
                         ),
+                        rx.checkbox(
+                            "Group publishes per device (devices/<deviceId>/telemetry)",
+                            name="mqtt_batch_publish",
+                            checked=SettingsState.mqtt_batch_publish,
+                            on_change=SettingsState.set_mqtt_batch_publish,
+                        ),
                         # CA Certificate section - only show when TLS enabled and not insecure
                         rx.cond(
                             SettingsState.mqtt_tls_enabled & ~SettingsState.mqtt_tls_insecure,
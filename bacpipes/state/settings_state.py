@@ -30,6 +30,7 @@ class SettingsState(rx.State):
     mqtt_tls_enabled: bool = False
     mqtt_tls_insecure: bool = False
     mqtt_ca_cert_path: str = ""
+    mqtt_batch_publish: bool = False
 
     # MQTT Subscription settings (override prefix is fixed to "override/#")
     mqtt_subscribe_enabled: bool = False
@@ -93,6 +94,7 @@ class SettingsState(rx.State):
             "mqtt_tls_enabled": False,
             "mqtt_tls_insecure": False,
             "mqtt_ca_cert_path": "",
+            "mqtt_batch_publish": False,
             "mqtt_subscribe_enabled": False,
             "ca_cert_filename": "",
         }
@@ -137,6 +139,7 @@ class SettingsState(rx.State):
             result["mqtt_tls_enabled"] = mqtt_config.tlsEnabled
             result["mqtt_tls_insecure"] = mqtt_config.tlsInsecure
             result["mqtt_ca_cert_path"] = mqtt_config.caCertPath or ""
+            result["mqtt_batch_publish"] = mqtt_config.batchPublish
             result["mqtt_subscribe_enabled"] = mqtt_config.subscribeEnabled
 
             # Extract filename from path if cert exists
@@ -171,6 +174,7 @@ class SettingsState(rx.State):
             self.mqtt_tls_enabled = result["mqtt_tls_enabled"]
             self.mqtt_tls_insecure = result["mqtt_tls_insecure"]
             self.mqtt_ca_cert_path = result["mqtt_ca_cert_path"]
+            self.mqtt_batch_publish = result["mqtt_batch_publish"]
             self.mqtt_subscribe_enabled = result["mqtt_subscribe_enabled"]
             self.ca_cert_filename = result["ca_cert_filename"]
             self.is_loading = False
@@ -223,6 +227,7 @@ class SettingsState(rx.State):
         # Use state values for checkboxes (on_change already updated them)
         tls_enabled = self.mqtt_tls_enabled
         tls_insecure = self.mqtt_tls_insecure
+        batch_publish = self.mqtt_batch_publish
 
         if not broker:
             self.mqtt_save_message = "MQTT broker is required"
@@ -241,6 +246,7 @@ class SettingsState(rx.State):
             mqtt_config.password = password or None
             mqtt_config.tlsEnabled = tls_enabled
             mqtt_config.tlsInsecure = tls_insecure
+            mqtt_config.batchPublish = batch_publish
             # Don't overwrite caCertPath - it's managed by upload
             mqtt_config.updatedAt = datetime.now()
 
@@ -252,7 +258,7 @@ class SettingsState(rx.State):
         self.mqtt_client_id = client_id
         self.mqtt_username = username
         self.mqtt_password = password
-        self.mqtt_save_message = "MQTT configuration saved. Restart worker to apply TLS changes."
+        self.mqtt_save_message = "MQTT configuration saved. Restart worker to apply TLS and publishing changes."
 
     async def save_system_config(self, form_data: dict):
         """Save system configuration (timezone, poll interval)."""
@@ -428,6 +434,10 @@ class SettingsState(rx.State):
     def set_mqtt_tls_insecure(self, value: bool):
         """Toggle MQTT TLS insecure mode."""
         self.mqtt_tls_insecure = value
+
+    def set_mqtt_batch_publish(self, value: bool):
+        """Toggle grouped per-device publishing."""
+        self.mqtt_batch_publish = value
         self.ca_cert_upload_message = ""  # Clear any message
 
     async def handle_ca_cert_upload(self, files: list[rx.UploadFile]):
@@ -3,7 +3,7 @@
 import asyncio
 import struct
 import logging
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from bacpypes3.ipv4.app import NormalApplication
 from bacpypes3.local.device import DeviceObject
@@ -29,6 +29,73 @@ OBJ_TYPE_MAP = {
     'date-value': 'dateValue',
 }
 
+# Concurrency limits for outstanding confirmed requests
+MAX_REQUESTS_PER_DEVICE = 4
+MAX_REQUESTS_TOTAL = 128
+
+# Precompiled big-endian decoders for tag data, keyed by payload length
+_UNSIGNED_STRUCTS = {
+    1: struct.Struct('>B'),
+    2: struct.Struct('>H'),
+    4: struct.Struct('>I'),
+}
+_SIGNED_STRUCTS = {
+    1: struct.Struct('>b'),
+    2: struct.Struct('>h'),
+    4: struct.Struct('>i'),
+}
+_REAL_STRUCT = struct.Struct('>f')
+_DOUBLE_STRUCT = struct.Struct('>d')
+
+
+def _decode_boolean(data: memoryview) -> bool:
+    return bool(data[0])
+
+
+def _decode_unsigned(data: memoryview) -> int:
+    unpacker = _UNSIGNED_STRUCTS.get(len(data))
+    if unpacker:
+        return unpacker.unpack_from(data)[0]
+    return int.from_bytes(data, byteorder='big')
+
+
+def _decode_integer(data: memoryview) -> int:
+    unpacker = _SIGNED_STRUCTS.get(len(data))
+    if unpacker:
+        return unpacker.unpack_from(data)[0]
+    return int.from_bytes(data, byteorder='big', signed=True)
+
+
+def _decode_real(data: memoryview) -> float:
+    return _REAL_STRUCT.unpack_from(data)[0]
+
+
+def _decode_double(data: memoryview) -> float:
+    return _DOUBLE_STRUCT.unpack_from(data)[0]
+
+
+def _decode_character_string(data: memoryview) -> str:
+    return bytes(data).decode('utf-8')
+
+
+def _decode_enumerated(data: memoryview) -> int:
+    return int.from_bytes(data, byteorder='big')
+
+
+# Application tag number -> decoder
+_TAG_DECODERS = {
+    1: _decode_boolean,
+    2: _decode_unsigned,
+    3: _decode_integer,
+    4: _decode_real,
+    5: _decode_double,
+    7: _decode_character_string,
+    9: _decode_enumerated,
+}
+
+# Python scalar bases of the BACpypes3 numeric primitives (bool is an int)
+_SCALAR_TYPES = (int, float)
+
 
 class BACnetClient:
     """BACpypes3 client wrapper for BACnet operations."""
@@ -43,12 +110,21 @@ class BACnetClient:
         self.max_retries = 3
         self.base_timeout = 6000  # 6 seconds
 
+        # Per-device limit keeps one slow device from hogging invoke IDs,
+        # the global limit bounds total in-flight APDUs
+        self._dev_sems: Dict[str, asyncio.Semaphore] = {}
+        self._global_sem = asyncio.Semaphore(MAX_REQUESTS_TOTAL)
+
+        # Parsed addresses and object identifiers, reused across poll cycles
+        self._addresses: Dict[Tuple[str, int], Address] = {}
+        self._object_ids: Dict[Tuple[str, int], ObjectIdentifier] = {}
+
     def initialize(self) -> bool:
         """Initialize BACpypes3 application."""
         try:
             # Create BACnet device
             device = DeviceObject(
-                objectIdentifier=ObjectIdentifier(f"device,{self.device_id}"),
+                objectIdentifier=ObjectIdentifier(("device", self.device_id)),
                 objectName="BacPipes",
                 vendorIdentifier=842,  # Servisys
                 maxApduLengthAccepted=1024,
@@ -77,6 +153,13 @@ class BACnetClient:
                 logger.warning(f"Error closing BACnet app: {e}")
             self.app = None
 
+    def _device_semaphore(self, device_ip: str) -> asyncio.Semaphore:
+        """Get the request semaphore for a device, creating it on first use."""
+        sem = self._dev_sems.get(device_ip)
+        if sem is None:
+            sem = self._dev_sems[device_ip] = asyncio.Semaphore(MAX_REQUESTS_PER_DEVICE)
+        return sem
+
     async def read_property(
         self,
         device_ip: str,
@@ -90,9 +173,10 @@ class BACnetClient:
             logger.error("BACnet app not initialized")
             return None
 
-        obj_type_bacnet = OBJ_TYPE_MAP.get(object_type, object_type)
-        device_address = Address(f"{device_ip}:{device_port}")
-        object_id = ObjectIdentifier(f"{obj_type_bacnet},{object_instance}")
+        device_address = self._address(device_ip, device_port)
+        object_id = self._object_id(object_type, object_instance)
+        property_id = PropertyIdentifier(property_name)
+        device_sem = self._device_semaphore(device_ip)
 
         for attempt in range(self.max_retries + 1):
             try:
@@ -102,18 +186,20 @@ class BACnetClient:
                 # Create read request
                 request = ReadPropertyRequest(
                     objectIdentifier=object_id,
-                    propertyIdentifier=PropertyIdentifier(property_name),
+                    propertyIdentifier=property_id,
                     destination=device_address,
                 )
 
                 # Send request with timeout
-                response = await asyncio.wait_for(
-                    self.app.request(request),
-                    timeout=timeout / 1000.0,
-                )
+                async with device_sem, self._global_sem:
+                    response = await asyncio.wait_for(
+                        self.app.request(request),
+                        timeout=timeout / 1000.0,
+                    )
 
-                if response and hasattr(response, 'propertyValue'):
-                    return self._extract_value(response.propertyValue)
+                property_value = getattr(response, 'propertyValue', None)
+                if property_value is not None:
+                    return self._extract_value(property_value)
 
             except asyncio.TimeoutError:
                 logger.debug(f"Timeout on attempt {attempt + 1}")
@@ -133,6 +219,23 @@ class BACnetClient:
         logger.error(f"Failed to read {object_type}:{object_instance} after {self.max_retries + 1} attempts")
         return None
 
+    def _address(self, device_ip: str, device_port: int) -> Address:
+        """Get the BACnet address for a device, parsing it on first use."""
+        key = (device_ip, device_port)
+        address = self._addresses.get(key)
+        if address is None:
+            address = self._addresses[key] = Address(f"{device_ip}:{device_port}")
+        return address
+
+    def _object_id(self, object_type: str, object_instance: int) -> ObjectIdentifier:
+        """Get the object identifier for a point, building it on first use."""
+        key = (object_type, object_instance)
+        object_id = self._object_ids.get(key)
+        if object_id is None:
+            obj_type_bacnet = OBJ_TYPE_MAP.get(object_type, object_type)
+            object_id = self._object_ids[key] = ObjectIdentifier((obj_type_bacnet, object_instance))
+        return object_id
+
     async def write_property(
         self,
         device_ip: str,
@@ -152,9 +255,8 @@ class BACnetClient:
         try:
             from bacpypes3.primitivedata import Real, Unsigned
 
-            obj_type_bacnet = OBJ_TYPE_MAP.get(object_type, object_type)
-            device_address = Address(f"{device_ip}:{device_port}")
-            object_id = ObjectIdentifier(f"{obj_type_bacnet},{object_instance}")
+            device_address = self._address(device_ip, device_port)
+            object_id = self._object_id(object_type, object_instance)
 
             # Convert value to appropriate BACnet type
             if 'multi-state' in object_type:
@@ -173,10 +275,11 @@ class BACnetClient:
             request.propertyValue = write_value
 
             # Send request
-            await asyncio.wait_for(
-                self.app.request(request),
-                timeout=10.0,
-            )
+            async with self._device_semaphore(device_ip), self._global_sem:
+                await asyncio.wait_for(
+                    self.app.request(request),
+                    timeout=10.0,
+                )
 
             return True, None
 
@@ -189,90 +292,67 @@ class BACnetClient:
     def _extract_value(self, bacnet_value) -> Optional[Any]:
         """Extract readable value from BACnet property value."""
         try:
-            # Direct numeric/boolean types
-            if isinstance(bacnet_value, (int, float, bool)):
+            # Fast path: BACpypes3 Real/Double/Unsigned/Integer/Boolean/Enumerated
+            # subclass the Python scalar types, so most reads stop here
+            if isinstance(bacnet_value, _SCALAR_TYPES):
                 return bacnet_value
 
+            # CharacterString subclasses str and can never be an object repr
+            if isinstance(bacnet_value, str):
+                return self._parse_scalar_string(bacnet_value)
+
             # Try .value attribute
-            if hasattr(bacnet_value, 'value'):
-                extracted = bacnet_value.value
-                if isinstance(extracted, (int, float, bool, str)):
-                    return extracted
+            extracted = getattr(bacnet_value, 'value', None)
+            if isinstance(extracted, (int, float, bool, str)):
+                return extracted
 
-            # Check string representation
+            # Check string representation (rare, unknown types only)
             value_str = str(bacnet_value)
 
             # Handle object representations
             if "bacpypes3" in value_str and "object at" in value_str:
-                if hasattr(bacnet_value, 'tagList') and bacnet_value.tagList:
-                    return self._extract_from_taglist(bacnet_value.tagList)
-            else:
-                # Try to parse as number
-                value_clean = value_str.strip()
-                try:
-                    if '.' in value_clean:
-                        return float(value_clean)
-                    else:
-                        return int(value_clean)
-                except ValueError:
-                    if len(value_clean) < 100:
-                        return value_clean
+                tag_list = getattr(bacnet_value, 'tagList', None)
+                if tag_list:
+                    return self._extract_from_taglist(tag_list)
+                return None
 
-            return None
+            return self._parse_scalar_string(value_str)
 
         except Exception as e:
             logger.error(f"Value extraction error: {e}")
             return None
 
+    def _parse_scalar_string(self, value_str: str) -> Optional[Any]:
+        """Parse a string value as a number, falling back to the short string."""
+        value_clean = value_str.strip()
+        try:
+            if '.' in value_clean:
+                return float(value_clean)
+            else:
+                return int(value_clean)
+        except ValueError:
+            if len(value_clean) < 100:
+                return value_clean
+        return None
+
     def _extract_from_taglist(self, tag_list) -> Optional[Any]:
         """Extract value from BACpypes3 tag list."""
-        tag_list = list(tag_list)
-
-        # Find tag with data
-        data_tag = None
-        for tag in tag_list:
-            if hasattr(tag, 'tag_data') and tag.tag_data and len(tag.tag_data) > 0:
-                data_tag = tag
-                break
+        # Single pass: first tag carrying data, else the first tag at all
+        data_tag = next((t for t in tag_list if getattr(t, 'tag_data', None)), None)
+        if data_tag is None:
+            data_tag = next(iter(tag_list), None)
 
-        if not data_tag and tag_list:
-            data_tag = tag_list[0]
-
-        if data_tag and hasattr(data_tag, 'tag_data') and hasattr(data_tag, 'tag_number'):
-            tag_number = data_tag.tag_number
-            tag_data = data_tag.tag_data
+        if data_tag is None:
+            return None
 
-            if not tag_data or len(tag_data) == 0:
-                return None
+        tag_number = getattr(data_tag, 'tag_number', None)
+        tag_data = getattr(data_tag, 'tag_data', None)
+        if tag_number is None or not tag_data:
+            return None
 
-            # Decode based on tag type
-            if tag_number == 1:  # Boolean
-                return bool(tag_data[0])
-            elif tag_number == 2:  # Unsigned
-                if len(tag_data) == 1:
-                    return tag_data[0]
-                elif len(tag_data) == 2:
-                    return struct.unpack('>H', tag_data)[0]
-                elif len(tag_data) == 4:
-                    return struct.unpack('>I', tag_data)[0]
-                else:
-                    return int.from_bytes(tag_data, byteorder='big')
-            elif tag_number == 3:  # Integer
-                if len(tag_data) == 1:
-                    return struct.unpack('>b', tag_data)[0]
-                elif len(tag_data) == 2:
-                    return struct.unpack('>h', tag_data)[0]
-                elif len(tag_data) == 4:
-                    return struct.unpack('>i', tag_data)[0]
-                else:
-                    return int.from_bytes(tag_data, byteorder='big', signed=True)
-            elif tag_number == 4:  # Real (float)
-                return struct.unpack('>f', tag_data)[0]
-            elif tag_number == 5:  # Double
-                return struct.unpack('>d', tag_data)[0]
-            elif tag_number == 7:  # CharacterString
-                return tag_data.decode('utf-8')
-            elif tag_number == 9:  # Enumerated
-                return int.from_bytes(tag_data, byteorder='big')
+        decoder = _TAG_DECODERS.get(tag_number)
+        if decoder is None:
+            return None
 
-        return None
+        # View over the tag bytes so struct unpacks without copying
+        return decoder(memoryview(tag_data))
@@ -5,15 +5,16 @@ import os
 import time
 import socket
 import logging
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional
 
 from sqlmodel import Session, select, create_engine
 
 from bacpypes3.pdu import Address
 from bacpypes3.primitivedata import ObjectIdentifier
-from bacpypes3.basetypes import PropertyIdentifier
+from bacpypes3.basetypes import ErrorType, PropertyIdentifier, PropertyReference
 from bacpypes3.apdu import ErrorRejectAbortNack, WhoIsRequest, IAmRequest
 from bacpypes3.ipv4.app import NormalApplication
 from bacpypes3.local.device import DeviceObject
@@ -27,6 +28,74 @@ logger = logging.getLogger(__name__)
 # Lock file for coordination with polling worker
 DISCOVERY_LOCK_FILE = Path("/tmp/bacnet_discovery_active")
 
+# Connection pool shared by every discovery run in this process
+DB_POOL_SIZE = 5
+DB_POOL_RECYCLE = 1800
+
+_engine = None
+
+# Properties read from every discovered object
+OBJECT_PROPERTIES = (
+    "objectName", "description", "presentValue", "units",
+    "priorityArray", "minPresValue", "maxPresValue",
+)
+_PROPERTY_NAMES = {int(PropertyIdentifier(prop)): prop for prop in OBJECT_PROPERTIES}
+
+# Built once and reused for every object: the ReadPropertyMultiple property
+# references and the identifiers used by single-property reads
+_PROPERTY_REFERENCES = [PropertyReference(propertyIdentifier=prop) for prop in OBJECT_PROPERTIES]
+_PROPERTY_IDS = {
+    prop: PropertyIdentifier(prop)
+    for prop in OBJECT_PROPERTIES + ("objectList",)
+}
+
+# Objects per ReadPropertyMultiple request (halved when a device rejects it)
+RPM_BATCH_SIZE = 16
+
+# Requests in flight to a single device (devices are still scanned in parallel)
+MAX_REQUESTS_PER_DEVICE = 4
+
+# Discovery may finish before the job timeout once every device scan is done
+# and no I-Am has arrived for this long (seconds)
+DISCOVERY_IDLE_WINDOW = 10
+
+# ...but never before Who-Is has been listened to for this long (seconds), so
+# slow responders (e.g. behind a router or BBMD) are not dropped - save_results
+# replaces all devices, so a missed device loses its points and tagging
+WHO_IS_LISTEN_MIN = 30
+
+# Extra time (seconds) given to in-flight device scans once the job timeout or
+# idle window has ended; scans still running after this are cancelled
+SCAN_GRACE_PERIOD = 30
+
+
+@dataclass(slots=True)
+class DiscoveredPoint:
+    """A discovered BACnet object and the OBJECT_PROPERTIES read from it (None if unread)."""
+
+    object_type: str
+    object_instance: int
+    objectName: Optional[str] = None
+    description: Optional[str] = None
+    presentValue: Optional[str] = None
+    units: Optional[str] = None
+    priorityArray: Optional[str] = None
+    minPresValue: Optional[str] = None
+    maxPresValue: Optional[str] = None
+
+
+def get_engine(db_url: str):
+    """Return the process-wide discovery engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            db_url,
+            pool_size=DB_POOL_SIZE,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return _engine
+
 
 class DiscoveryApp(NormalApplication):
     """BACpypes3 application for BACnet device discovery."""
@@ -34,7 +103,7 @@ class DiscoveryApp(NormalApplication):
     def __init__(self, local_address: Address, device_id: int = 3001234, timeout: int = 15):
         # Create device object
         device = DeviceObject(
-            objectIdentifier=ObjectIdentifier(f"device,{device_id}"),
+            objectIdentifier=ObjectIdentifier(("device", device_id)),
             objectName="BacPipes Discovery",
             vendorIdentifier=999,
             maxApduLengthAccepted=1024,
@@ -45,27 +114,72 @@ class DiscoveryApp(NormalApplication):
 
         self.timeout = timeout
         self.found_devices: List[Tuple[str, int]] = []
-        self.all_points: List[Dict] = []
+        # Results grouped by BACnet device ID as they are read
+        self.device_names: Dict[int, str] = {}
+        self.device_points: Dict[int, List[DiscoveredPoint]] = {}
+
+        # Per-device request limits, keyed by device address
+        self._dev_sems: Dict[str, asyncio.Semaphore] = {}
+
+        # Devices known to answer / reject ReadPropertyMultiple, keyed by address
+        self._rpm_supported: Set[str] = set()
+        self._rpm_unsupported: Set[str] = set()
+
+        # Device scans started from do_IAmRequest (no new scans once closed)
+        self.scan_tasks: List[asyncio.Task] = []
+        self.accepting_scans = True
+
+        # Activity tracking for early completion (see run_discovery_async)
+        self.active_scans = 0
+        self.last_i_am = time.monotonic()
 
     async def do_IAmRequest(self, apdu: IAmRequest) -> None:
         """Handle I-Am responses from devices."""
         device_id = apdu.iAmDeviceIdentifier[1]
         device_address = str(apdu.pduSource)
 
+        # Late I-Am after the wait has ended - the results are already being saved
+        if not self.accepting_scans:
+            return
+
+        # Devices can answer Who-Is more than once; scan each one once
+        if device_id in self.device_points:
+            return
+
         logger.info(f"Found device {device_id} at {device_address}")
+        self.device_points[device_id] = []
         self.found_devices.append((device_address, device_id))
 
-        # Read device objects
-        await self.read_device_objects(device_address, device_id)
+        # Scan the device in its own task so further I-Am responses (and other
+        # devices' scans) are not held up behind this one
+        self.active_scans += 1
+        self.last_i_am = time.monotonic()
+        self.scan_tasks.append(asyncio.create_task(self._scan_device(apdu.pduSource, device_id)))
 
-    async def read_property_value(self, address: str, object_id: ObjectIdentifier, property_name: str):
+    async def _scan_device(self, address: Address, device_id: int):
+        """Read a device's objects (reusing the parsed source address for every request)."""
+        try:
+            await self.read_device_objects(address, device_id)
+        finally:
+            self.active_scans -= 1
+
+    def _device_semaphore(self, address: Address) -> asyncio.Semaphore:
+        """Get the request semaphore for a device, creating it on first use."""
+        key = str(address)
+        sem = self._dev_sems.get(key)
+        if sem is None:
+            sem = self._dev_sems[key] = asyncio.Semaphore(MAX_REQUESTS_PER_DEVICE)
+        return sem
+
+    async def read_property_value(self, address: Address, object_id: ObjectIdentifier, property_name: str):
         """Read a single property from a BACnet object."""
         try:
-            value = await self.read_property(
-                Address(address),
-                object_id,
-                PropertyIdentifier(property_name)
-            )
+            async with self._device_semaphore(address):
+                value = await self.read_property(
+                    address,
+                    object_id,
+                    _PROPERTY_IDS.get(property_name) or PropertyIdentifier(property_name)
+                )
             return value
         except ErrorRejectAbortNack as e:
             logger.debug(f"Error reading {property_name} from {object_id}: {e}")
@@ -74,16 +188,17 @@ class DiscoveryApp(NormalApplication):
             logger.debug(f"Exception reading {property_name} from {object_id}: {e}")
             return None
 
-    async def read_device_objects(self, device_address: str, device_id: int):
+    async def read_device_objects(self, device_address: Address, device_id: int):
         """Read all objects from a device."""
         try:
             # Read device name
-            device_obj_id = ObjectIdentifier(f"device,{device_id}")
+            device_obj_id = ObjectIdentifier(("device", device_id))
             device_name = await self.read_property_value(device_address, device_obj_id, "objectName")
             if device_name is None:
                 device_name = f"Device_{device_id}"
             else:
                 device_name = str(device_name)
+            self.device_names[device_id] = device_name
 
             # Read object list
             object_list = await self.read_property_value(device_address, device_obj_id, "objectList")
@@ -93,45 +208,90 @@ class DiscoveryApp(NormalApplication):
 
             logger.info(f"Device '{device_name}' has {len(object_list)} objects")
 
-            # Read properties for each object
-            for obj_id in object_list:
-                obj_type = str(obj_id[0])
-                if obj_type in ("device", "network-port"):
-                    continue  # Skip device and network-port objects
-
-                await self.read_object_properties(device_address, device_id, device_name, obj_id)
+            # Read properties, several objects per request
+            objects = [
+                obj_id for obj_id in object_list
+                if str(obj_id[0]) not in ("device", "network-port")  # Skip device and network-port objects
+            ]
+            # Concurrency is bounded per device by _device_semaphore
+            await asyncio.gather(*(
+                self.read_objects_batch(device_address, device_id, objects[start:start + RPM_BATCH_SIZE])
+                for start in range(0, len(objects), RPM_BATCH_SIZE)
+            ))
 
         except Exception as e:
             logger.error(f"Error reading device {device_id}: {e}")
 
-    async def read_object_properties(self, device_address: str, device_id: int, device_name: str, obj_id):
-        """Read properties from a single object."""
+    async def read_objects_batch(self, device_address: Address, device_id: int, obj_ids: List):
+        """Read OBJECT_PROPERTIES for several objects with one ReadPropertyMultiple.
+
+        If the device rejects the request the batch is split in half and
+        retried; a single object that still fails is read property by property.
+        Once single-object requests fail on a device that has never answered
+        one, its remaining objects skip ReadPropertyMultiple altogether.
+        """
+        device_key = str(device_address)
+        if device_key in self._rpm_unsupported:
+            await asyncio.gather(*(
+                self.read_object_properties(device_address, device_id, obj_id)
+                for obj_id in obj_ids
+            ))
+            return
+
+        parameter_list = []
+        for obj_id in obj_ids:
+            parameter_list.extend((obj_id, list(_PROPERTY_REFERENCES)))
+
         try:
-            object_type = str(obj_id[0])
-            object_instance = obj_id[1]
-
-            obj_identifier = ObjectIdentifier(f"{object_type},{object_instance}")
-
-            point_data = {
-                'device_id': device_id,
-                'device_name': device_name,
-                'device_ip': device_address.split(':')[0] if ':' in device_address else device_address,
-                'object_type': object_type,
-                'object_instance': object_instance,
-            }
-
-            # Read properties
-            properties = [
-                "objectName", "description", "presentValue", "units",
-                "priorityArray", "minPresValue", "maxPresValue"
-            ]
+            async with self._device_semaphore(device_address):
+                response = await self.read_property_multiple(device_address, parameter_list)
+        except Exception as e:
+            logger.debug(f"ReadPropertyMultiple failed for {len(obj_ids)} objects on {device_address}: {e}")
+            if len(obj_ids) > 1:
+                mid = len(obj_ids) // 2
+                await asyncio.gather(
+                    self.read_objects_batch(device_address, device_id, obj_ids[:mid]),
+                    self.read_objects_batch(device_address, device_id, obj_ids[mid:]),
+                )
+            else:
+                if device_key not in self._rpm_supported:
+                    self._rpm_unsupported.add(device_key)
+                await self.read_object_properties(device_address, device_id, obj_ids[0])
+            return
 
-            for prop in properties:
-                value = await self.read_property_value(device_address, obj_identifier, prop)
+        self._rpm_supported.add(device_key)
+
+        # (object type, instance) -> {property name: value}
+        values: Dict[Tuple[str, int], Dict[str, str]] = {}
+        for object_identifier, property_identifier, _, property_value in response:
+            # Per-property errors (e.g. no units on a binary object) are skipped
+            if property_value is None or isinstance(property_value, ErrorType):
+                continue
+            prop = _PROPERTY_NAMES.get(int(property_identifier))
+            if prop is not None:
+                key = (str(object_identifier[0]), object_identifier[1])
+                values.setdefault(key, {})[prop] = str(property_value)
+
+        points = self.device_points[device_id]
+        for obj_id in obj_ids:
+            key = (str(obj_id[0]), obj_id[1])
+            points.append(DiscoveredPoint(*key, **values.get(key, {})))
+
+    async def read_object_properties(self, device_address: Address, device_id: int, obj_id):
+        """Read properties from a single object, one concurrent request per property."""
+        try:
+            point = DiscoveredPoint(str(obj_id[0]), obj_id[1])
+
+            # obj_id comes from the device's objectList and is already an ObjectIdentifier
+            values = await asyncio.gather(*(
+                self.read_property_value(device_address, obj_id, prop)
+                for prop in OBJECT_PROPERTIES
+            ))
+            for prop, value in zip(OBJECT_PROPERTIES, values):
                 if value is not None:
-                    point_data[prop] = str(value)
+                    setattr(point, prop, str(value))
 
-            self.all_points.append(point_data)
+            self.device_points[device_id].append(point)
 
         except Exception as e:
             logger.error(f"Error reading object {obj_id}: {e}")
@@ -154,7 +314,7 @@ async def run_discovery_async(job_id: str):
         "DATABASE_URL",
         "postgresql://bacpipes@localhost:5432/bacpipes"
     )
-    engine = create_engine(db_url)
+    engine = get_engine(db_url)
 
     # Load job from database
     with Session(engine) as session:
@@ -200,15 +360,41 @@ async def run_discovery_async(job_id: str):
         who_is = WhoIsRequest(destination=Address(f"{broadcast_ip}/24"))
         await app.request(who_is)
 
-        # Wait for responses
-        logger.info(f"Waiting {timeout}s for responses...")
-        await asyncio.sleep(timeout)
+        # Wait for responses, up to the timeout or until discovery goes quiet
+        logger.info(f"Waiting up to {timeout}s for responses...")
+        started = time.monotonic()
+        deadline = started + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(1)
+            now = time.monotonic()
+            if (
+                app.found_devices
+                and app.active_scans == 0
+                and now - started >= WHO_IS_LISTEN_MIN
+                and now - app.last_i_am >= DISCOVERY_IDLE_WINDOW
+            ):
+                logger.info("No new devices - finishing early")
+                break
+
+        # Let scans of devices that answered in time finish before saving,
+        # within a bounded grace period
+        app.accepting_scans = False
+        if app.active_scans:
+            logger.info(f"Waiting up to {SCAN_GRACE_PERIOD}s for {app.active_scans} device scans to finish...")
+        if app.scan_tasks:
+            _, pending = await asyncio.wait(app.scan_tasks, timeout=SCAN_GRACE_PERIOD)
+            if pending:
+                logger.warning(f"Cancelling {len(pending)} unfinished device scans")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
 
         logger.info(f"=== Discovery Complete ===")
-        logger.info(f"Found {len(app.found_devices)} devices, {len(app.all_points)} points")
+        points_found = sum(len(points) for points in app.device_points.values())
+        logger.info(f"Found {len(app.found_devices)} devices, {points_found} points")
 
         # Save to database
-        await save_results(engine, job_id, app.found_devices, app.all_points)
+        await save_results(engine, job_id, app.found_devices, app.device_names, app.device_points)
 
         app.close()
 
@@ -232,8 +418,17 @@ async def run_discovery_async(job_id: str):
             logger.info("Discovery lock removed")
 
 
-async def save_results(engine, job_id: str, devices: List[Tuple[str, int]], points: List[Dict]):
+async def save_results(
+    engine,
+    job_id: str,
+    devices: List[Tuple[str, int]],
+    device_names: Dict[int, str],
+    device_points: Dict[int, List[DiscoveredPoint]],
+):
     """Save discovery results to database."""
+    # One timestamp for every device and point row written by this run
+    now = datetime.now()
+
     with Session(engine) as session:
         devices_saved = 0
         points_saved = 0
@@ -247,92 +442,54 @@ async def save_results(engine, job_id: str, devices: List[Tuple[str, int]], poin
         session.commit()
         logger.info(f"Deleted {len(all_devices)} existing devices")
 
-        # Group points by device
-        device_points = {}
-        for point in points:
-            dev_id = point['device_id']
-            if dev_id not in device_points:
-                device_points[dev_id] = []
-            device_points[dev_id].append(point)
-
-        # Save devices and points
+        # Save devices and points. Every device was deleted above and the
+        # device list is de-duplicated, so all rows are inserts.
         for device_address, device_id in devices:
-            device_name = next(
-                (p['device_name'] for p in points if p['device_id'] == device_id),
-                f"Device_{device_id}"
-            )
+            device_name = device_names.get(device_id, f"Device_{device_id}")
 
             ip = device_address.split(':')[0] if ':' in device_address else device_address
 
-            # Check if device exists
-            existing_device = session.exec(
-                select(Device).where(Device.deviceId == device_id)
-            ).first()
-
-            if existing_device:
-                existing_device.deviceName = device_name
-                existing_device.ipAddress = ip
-                existing_device.lastSeenAt = datetime.now()
-                session.add(existing_device)
-                db_device_id = existing_device.id
-            else:
-                new_device = Device(
-                    deviceId=device_id,
-                    deviceName=device_name,
-                    ipAddress=ip,
-                    port=47808,
-                    enabled=True,
-                )
-                session.add(new_device)
-                session.commit()
-                session.refresh(new_device)
-                db_device_id = new_device.id
+            new_device = Device(
+                deviceId=device_id,
+                deviceName=device_name,
+                ipAddress=ip,
+                port=47808,
+                enabled=True,
+                discoveredAt=now,
+                lastSeenAt=now,
+            )
+            session.add(new_device)
+            session.flush()  # Assigns new_device.id
+            db_device_id = new_device.id
 
             devices_saved += 1
 
-            # Save points for this device
-            if device_id in device_points:
-                for point_data in device_points[device_id]:
-                    # Check if point exists
-                    existing_point = session.exec(
-                        select(Point).where(
-                            Point.deviceId == db_device_id,
-                            Point.objectType == point_data.get('object_type', ''),
-                            Point.objectInstance == point_data.get('object_instance', 0),
-                        )
-                    ).first()
-
-                    if existing_point:
-                        object_name = point_data.get('objectName', 'Unknown')
-                        # Set bacnetName if not already set (first discovery after field was added)
-                        if not existing_point.bacnetName:
-                            existing_point.bacnetName = object_name
-                        # Always update pointName to current BACnet name
-                        existing_point.pointName = object_name
-                        existing_point.description = point_data.get('description')
-                        existing_point.units = point_data.get('units')
-                        existing_point.lastValue = point_data.get('presentValue')
-                        existing_point.lastPollTime = datetime.now()
-                        existing_point.updatedAt = datetime.now()
-                        session.add(existing_point)
-                    else:
-                        object_name = point_data.get('objectName', 'Unknown')
-                        new_point = Point(
-                            deviceId=db_device_id,
-                            objectType=point_data.get('object_type', ''),
-                            objectInstance=point_data.get('object_instance', 0),
-                            bacnetName=object_name,  # Set original (immutable)
-                            pointName=object_name,   # Set current
-                            description=point_data.get('description'),
-                            units=point_data.get('units'),
-                            enabled=True,
-                            isWritable='priorityArray' in point_data,
-                            lastValue=point_data.get('presentValue'),
-                            lastPollTime=datetime.now(),
-                        )
-                        session.add(new_point)
-
-                    points_saved += 1
+            # Save points for this device (an object listed twice is saved once)
+            seen = set()
+            new_points = []
+            for point in device_points.get(device_id, ()):
+                key = (point.object_type, point.object_instance)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                object_name = point.objectName if point.objectName is not None else 'Unknown'
+                new_points.append(Point(
+                    deviceId=db_device_id,
+                    objectType=point.object_type,
+                    objectInstance=point.object_instance,
+                    bacnetName=object_name,  # Set original (immutable)
+                    pointName=object_name,   # Set current
+                    description=point.description,
+                    units=point.units,
+                    enabled=True,
+                    isWritable=point.priorityArray is not None,
+                    lastValue=point.presentValue,
+                    lastPollTime=now,
+                ))
+
+            session.add_all(new_points)
+            points_saved += len(new_points)
 
         session.commit()
 
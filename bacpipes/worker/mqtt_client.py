@@ -3,17 +3,106 @@
 import json
 import ssl
 import time
+import threading
 import logging
-from typing import Optional, Callable, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Callable, Dict, Any, List, Union
+from datetime import datetime, timezone
 
 import paho.mqtt.client as mqtt
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the broker to accept a (re)connect
+CONNECT_TIMEOUT = 5
+
+# Paho flow control: QoS>0 messages awaiting ack (paho's default is 20)
+MAX_INFLIGHT_MESSAGES = 100
+
+
+def format_utc_timestamp(timestamp: datetime) -> str:
+    """Format an aware UTC datetime as ISO 8601 with a Z suffix."""
+    return timestamp.isoformat().replace("+00:00", "Z")
+
+
+def fill_point_payload(
+    payload: Dict[str, Any],
+    value: Any,
+    timestamp: str,
+    timezone_offset: int,
+) -> Optional[Dict[str, Any]]:
+    """Set value, timestamp and tz on a point payload in place.
+
+    Returns the payload, or None if the value must not be published.
+    """
+    if value is None:
+        return None
+
+    # Validate value
+    if isinstance(value, str) and ("bacpypes3" in value or "object at" in value):
+        logger.error(f"Prevented publishing object string for {payload.get('haystackName')}")
+        return None
+
+    # Clean value
+    if isinstance(value, (int, float)):
+        clean_value = float(value)
+    elif isinstance(value, bool):
+        clean_value = bool(value)
+    elif isinstance(value, str):
+        clean_value = str(value)
+    else:
+        clean_value = str(value)
+
+    payload["value"] = clean_value
+    payload["timestamp"] = timestamp
+    payload["tz"] = timezone_offset
+    return payload
+
+
+def point_payload_template(
+    units: Optional[str],
+    dis: Optional[str],
+    haystack_name: Optional[str],
+    object_type: str,
+    object_instance: int,
+) -> Dict[str, Any]:
+    """Build the per-point MQTT payload dict.
+
+    value, timestamp and tz are placeholders filled in on each publish;
+    the key order matches the published JSON.
+    """
+    return {
+        "value": None,
+        "timestamp": None,
+        "tz": None,
+        "units": units,
+        "quality": "good",
+        "dis": dis,
+        "haystackName": haystack_name,
+        "objectType": object_type,
+        "objectInstance": object_instance,
+    }
+
+
+def _dumps_payload(payload: Any) -> Union[bytes, str]:
+    """Encode an MQTT payload as JSON (orjson when installed, stdlib otherwise)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload)
+
 
 class MQTTClient:
-    """Paho MQTT client wrapper for BacPipes."""
+    """Paho MQTT client wrapper for BacPipes.
+
+    Point publishes use each point's configured QoS (Point.qos, default 1);
+    publish_point_value only falls back to QoS 0 for callers that pass none.
+    Paho's in-flight window is enlarged so bursts of QoS>0 publishes at the
+    top of a minute are not throttled; the outgoing queue stays unbounded.
+    """
 
     def __init__(
         self,
@@ -38,6 +127,12 @@ class MQTTClient:
         self.client: Optional[mqtt.Client] = None
         self.connected = False
 
+        # TLS context shared across reconnects (see _configure_tls)
+        self._ssl_ctx: Optional[ssl.SSLContext] = None
+
+        # Set by _on_connect once the broker accepts the connection
+        self._connected_event = threading.Event()
+
         # Callbacks
         self.on_message_callback: Optional[Callable] = None
 
@@ -62,6 +157,7 @@ class MQTTClient:
             self.client.on_connect = self._on_connect
             self.client.on_disconnect = self._on_disconnect
             self.client.on_message = self._on_message
+            self.client.max_inflight_messages_set(MAX_INFLIGHT_MESSAGES)
 
             # Authentication
             if self.username:
@@ -72,15 +168,14 @@ class MQTTClient:
             if self.tls_enabled:
                 self._configure_tls()
 
+            self._connected_event.clear()
             self.client.connect(self.broker, self.port, 60)
             self.client.loop_start()
 
             # Wait for connection with timeout (5 seconds max)
-            for _ in range(50):
-                if self.connected:
-                    logger.info(f"Connected to MQTT broker {self.broker}:{self.port}")
-                    return True
-                time.sleep(0.1)
+            if self._connected_event.wait(timeout=CONNECT_TIMEOUT):
+                logger.info(f"Connected to MQTT broker {self.broker}:{self.port}")
+                return True
 
             # Connection timed out
             logger.warning(f"MQTT broker connection timeout: {self.broker}:{self.port}")
@@ -92,38 +187,51 @@ class MQTTClient:
             return False
 
     def _configure_tls(self):
-        """Configure TLS for MQTT connection."""
-        import os
+        """Configure TLS for MQTT connection.
+
+        The SSLContext is built once and reused by later connects, so the
+        CA bundle is not re-read for every new client.
+        """
+        if self._ssl_ctx is None:
+            self._ssl_ctx = self._build_ssl_context()
 
+        self.client.tls_set_context(self._ssl_ctx)
         if self.tls_insecure:
-            self.client.tls_set(cert_reqs=ssl.CERT_NONE)
             self.client.tls_insecure_set(True)
+
+    def _build_ssl_context(self) -> ssl.SSLContext:
+        """Create the SSL context from the TLS settings."""
+        import os
+
+        if self.tls_insecure:
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
             logger.warning("TLS configured with INSECURE mode")
+            return ctx
+
+        ca_cert = self.ca_cert_path
+        if ca_cert:
+            if not os.path.exists(ca_cert):
+                logger.error(f"CA certificate not found: {ca_cert}")
+                ca_cert = None
+            elif not os.access(ca_cert, os.R_OK):
+                logger.error(f"CA certificate not readable: {ca_cert}")
+                ca_cert = None
+
+        if ca_cert:
+            ctx = ssl.create_default_context(cafile=ca_cert)
+            logger.info(f"TLS configured with CA: {ca_cert}")
         else:
-            ca_cert = self.ca_cert_path
-            if ca_cert:
-                if not os.path.exists(ca_cert):
-                    logger.error(f"CA certificate not found: {ca_cert}")
-                    ca_cert = None
-                elif not os.access(ca_cert, os.R_OK):
-                    logger.error(f"CA certificate not readable: {ca_cert}")
-                    ca_cert = None
-
-            if ca_cert:
-                self.client.tls_set(
-                    ca_certs=ca_cert,
-                    cert_reqs=ssl.CERT_REQUIRED,
-                    tls_version=ssl.PROTOCOL_TLS,
-                )
-                logger.info(f"TLS configured with CA: {ca_cert}")
-            else:
-                self.client.tls_set(cert_reqs=ssl.CERT_REQUIRED)
-                logger.info("TLS configured with system CA bundle")
+            ctx = ssl.create_default_context()
+            logger.info("TLS configured with system CA bundle")
+        return ctx
 
     def _on_connect(self, client, userdata, flags, rc):
         """MQTT connection callback."""
         if rc == 0:
             self.connected = True
+            self._connected_event.set()
             logger.info("MQTT connection established")
 
             # Subscribe to all configured topics
@@ -145,6 +253,7 @@ class MQTTClient:
     def _on_disconnect(self, client, userdata, rc):
         """MQTT disconnection callback."""
         self.connected = False
+        self._connected_event.clear()
         if rc != 0:
             logger.warning(f"MQTT unexpected disconnection (code {rc})")
 
@@ -159,6 +268,7 @@ class MQTTClient:
             self.client.loop_stop()
             self.client.disconnect()
             self.connected = False
+            self._connected_event.clear()
             logger.info("Disconnected from MQTT broker")
 
     def reconnect(self) -> bool:
@@ -168,13 +278,12 @@ class MQTTClient:
 
         if self.client:
             try:
+                self._connected_event.clear()
                 self.client.reconnect()
                 # Wait for connection with timeout (5 seconds max)
-                for _ in range(50):
-                    if self.connected:
-                        logger.info(f"Reconnected to MQTT broker {self.broker}:{self.port}")
-                        return True
-                    time.sleep(0.1)
+                if self._connected_event.wait(timeout=CONNECT_TIMEOUT):
+                    logger.info(f"Reconnected to MQTT broker {self.broker}:{self.port}")
+                    return True
                 logger.warning(f"MQTT reconnection timeout: {self.broker}:{self.port}")
                 return False
             except Exception as e:
@@ -186,7 +295,7 @@ class MQTTClient:
     def publish(
         self,
         topic: str,
-        payload: Dict[str, Any],
+        payload: Any,
         qos: int = 1,
         retain: bool = False,
     ) -> bool:
@@ -194,7 +303,7 @@ class MQTTClient:
 
         Args:
             topic: MQTT topic
-            payload: Dictionary to be JSON-encoded
+            payload: Dictionary (or list) to be JSON-encoded
             qos: Quality of service (0, 1, 2)
             retain: Retain flag
 
@@ -205,12 +314,15 @@ class MQTTClient:
             return False
 
         try:
-            self.client.publish(
+            info = self.client.publish(
                 topic=topic,
-                payload=json.dumps(payload),
+                payload=_dumps_payload(payload),
                 qos=qos,
                 retain=retain,
             )
+            if info.rc != mqtt.MQTT_ERR_SUCCESS:
+                logger.error(f"Failed to publish to {topic}: {mqtt.error_string(info.rc)}")
+                return False
 
             # Track data flow
             self.last_data_flow_time = time.time()
@@ -232,39 +344,43 @@ class MQTTClient:
         object_type: str,
         object_instance: int,
         timezone_offset: int,
-        qos: int = 1,
+        qos: int = 0,
+        payload_template: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None,
     ) -> bool:
-        """Publish a BACnet point value."""
-        if value is None:
-            return False
+        """Publish a BACnet point value.
 
-        # Validate value
-        if isinstance(value, str) and ("bacpypes3" in value or "object at" in value):
-            logger.error(f"Prevented publishing object string for {topic}")
-            return False
+        If payload_template (from point_payload_template) is given it is
+        reused: only value, timestamp and tz are updated before encoding.
+        timestamp is an ISO 8601 UTC string ending in "Z"; callers
+        publishing many points should format it once and pass it in.
+        """
+        if payload_template is None:
+            payload_template = point_payload_template(
+                units, dis, haystack_name, object_type, object_instance
+            )
 
-        # Clean value
-        if isinstance(value, (int, float)):
-            clean_value = float(value)
-        elif isinstance(value, bool):
-            clean_value = bool(value)
-        elif isinstance(value, str):
-            clean_value = str(value)
-        else:
-            clean_value = str(value)
-
-        timestamp = datetime.utcnow().isoformat() + "Z"
-
-        payload = {
-            "value": clean_value,
-            "timestamp": timestamp,
-            "tz": timezone_offset,
-            "units": units,
-            "quality": "good",
-            "dis": dis,
-            "haystackName": haystack_name,
-            "objectType": object_type,
-            "objectInstance": object_instance,
-        }
+        if timestamp is None:
+            timestamp = format_utc_timestamp(datetime.now(timezone.utc))
+
+        payload = fill_point_payload(payload_template, value, timestamp, timezone_offset)
+        if payload is None:
+            return False
 
         return self.publish(topic, payload, qos=qos, retain=False)
+
+    def publish_point_values_batch(
+        self,
+        topic: str,
+        payloads: List[Dict[str, Any]],
+        qos: int = 0,
+    ) -> bool:
+        """Publish several point payloads as one JSON array message.
+
+        Payloads are built with fill_point_payload; one message per batch
+        amortizes MQTT framing and TLS record overhead.
+        """
+        if not payloads:
+            return False
+
+        return self.publish(topic, payloads, qos=qos, retain=False)
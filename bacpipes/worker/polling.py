@@ -1,23 +1,36 @@
 """BACnet polling and MQTT publishing worker."""
 
 import asyncio
+import heapq
 import json
 import os
 import time
 import math
+import random
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 import pytz
+from sqlalchemy import bindparam, update
 from sqlmodel import Session, select, create_engine
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..models.device import Device
 from ..models.point import Point
 from ..models.mqtt_config import MqttConfig
 from ..models.system_settings import SystemSettings
 from .bacnet_client import BACnetClient
-from .mqtt_client import MQTTClient
+from .mqtt_client import (
+    MQTTClient,
+    fill_point_payload,
+    format_utc_timestamp,
+    point_payload_template,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -33,16 +46,104 @@ RESTART_FLAG_FILE = "/tmp/bacpipes_worker_restart"
 
 # Fixed override subscription constants
 OVERRIDE_PREFIX = "override"
+OVERRIDE_PREFIX_SLASH = OVERRIDE_PREFIX + "/"
 OVERRIDE_PATTERN = "override/#"
 OVERRIDE_QOS = 1
 
+# Seconds after an aligned slot during which a due point may still be read
+ALIGNMENT_WINDOW = 2
+
+# Minimum seconds between checks of the discovery lock / restart flag files
+FLAG_CHECK_INTERVAL = 2.0
+
+# MQTT reconnect backoff (seconds)
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+
+# Grouped publish mode: one JSON array per device per cycle on this topic
+BATCH_TOPIC_FORMAT = "devices/{device_id}/telemetry"
+
+# Main loop sleep bounds (seconds): sleep until the next point is due, but
+# never longer than the flag-check cadence so lock/restart flags stay responsive
+MIN_LOOP_SLEEP = 0.05
+MAX_LOOP_SLEEP = FLAG_CHECK_INTERVAL
+
+# Upper bound on concurrent BACnet reads per poll cycle
+MAX_CONCURRENT_READS = 32
+
+# Upper bound on concurrent BACnet override writes
+MAX_CONCURRENT_WRITES = 16
+
+# How long the enabled point list is reused before re-querying (seconds)
+POINTS_CACHE_TTL = 30
+
+# Connection pool for the worker's own engine. The poll loop only needs a
+# connection for the per-cycle flush plus the occasional status update;
+# pre-ping drops connections Postgres has closed while the worker idled.
+DB_POOL_SIZE = 5
+DB_POOL_RECYCLE = 1800
+
+# Enabled, published points joined to their (enabled) device. Only the
+# columns the poller uses are selected, so no ORM objects are built; the
+# filter columns (Point.mqttPublish/enabled, Device.enabled) are indexed.
+_ENABLED_POINTS_QUERY = (
+    select(
+        Point.id,
+        Point.objectType,
+        Point.objectInstance,
+        Point.pointName,
+        Point.dis,
+        Point.units,
+        Point.mqttTopic,
+        Point.pollInterval,
+        Point.qos,
+        Point.haystackPointName,
+        Point.isWritable,
+        Device.deviceId,
+        Device.ipAddress,
+        Device.port,
+    )
+    .join(Device, Point.deviceId == Device.id)
+    .where(Point.mqttPublish == True)
+    .where(Point.enabled == True)
+    .where(Device.enabled == True)
+)
+
+# Batched point value update (executemany, one row per polled point)
+_POINT_VALUE_UPDATE = (
+    update(Point.__table__)
+    .where(Point.__table__.c.id == bindparam("point_id"))
+    .values(
+        lastValue=bindparam("value"),
+        lastPollTime=bindparam("ts"),
+        updatedAt=bindparam("ts"),
+    )
+)
+
+
+def _parse_override_json(payload: bytes) -> Optional[Dict[str, Any]]:
+    """Parse a JSON object override payload; None means treat it as a raw value."""
+    # Raw overrides ("21.5", "active") never start with "{", skip the parser
+    if payload.lstrip()[:1] != b"{":
+        return None
+    try:
+        data = orjson.loads(payload) if orjson is not None else json.loads(payload)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
 
 class PollingWorker:
     """Main BACnet polling and MQTT publishing worker."""
 
     def __init__(self, db_url: str):
         self.db_url = db_url
-        self.engine = create_engine(db_url)
+        self.engine = create_engine(
+            db_url,
+            pool_size=DB_POOL_SIZE,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
 
         # Clients
         self.bacnet_client: Optional[BACnetClient] = None
@@ -59,14 +160,49 @@ class PollingWorker:
         self.point_last_poll: Dict[int, float] = {}
         self.poll_cycle = 0
 
+        # Enabled point list cache (see get_enabled_points)
+        self._points_cache: Optional[List[Dict[str, Any]]] = None
+        self._points_cache_ts: float = 0.0
+
+        # Poll schedule: min-heap of (next_due_time, point_id), rebuilt from
+        # the point list it was built for whenever that list is refreshed
+        self._schedule: List[Tuple[float, int]] = []
+        self._schedule_points: Dict[int, Dict[str, Any]] = {}
+        self._schedule_source: Optional[List[Dict[str, Any]]] = None
+
+        # Point values read this cycle, written in one batch: (point_id, value, timestamp)
+        self._pending_point_updates: List[Tuple[int, str, datetime]] = []
+
         # Subscription config
         self.subscribe_enabled: bool = False
         self.write_command_topic: str = "write/command"
         self.write_result_topic: str = "write/result"
+        self._mqtt_config_id: Optional[int] = None
+
+        # Exact-match topic routing for incoming messages (see handle_mqtt_message)
+        self._topic_handlers: Dict[str, Callable[[bytes], None]] = {}
+
+        # Grouped publish mode (MqttConfig.batchPublish): all values read from
+        # a device in a cycle go out as one message instead of one per point
+        self.batch_publish: bool = False
+
+        # Cached coordination flag file checks (see _check_flags)
+        self._flags_cache: Tuple[bool, bool] = (False, False)
+        self._last_flag_check = 0.0
+
+        # MQTT reconnect backoff state
+        self._reconnect_attempt = 0
+        self._next_reconnect_at = 0.0
 
         # Override handling - map mqtt topics to point info
         self.topic_to_point: Dict[str, Dict[str, Any]] = {}
 
+        # Override writes queued from the MQTT thread, drained by the worker loop
+        self.pending_overrides: asyncio.Queue = asyncio.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set when an override is queued, cuts the main loop sleep short
+        self._wake_event = asyncio.Event()
+
     def load_system_settings(self) -> bool:
         """Load system settings from database."""
         with Session(self.engine) as session:
@@ -102,6 +238,9 @@ class PollingWorker:
                 logger.warning("No MQTT config found")
                 return False
 
+            # Row targeted by update_mqtt_status
+            self._mqtt_config_id = config.id
+
             if not config.broker:
                 logger.warning("MQTT broker not configured - waiting for setup")
                 return False
@@ -119,84 +258,109 @@ class PollingWorker:
 
             # Load subscription settings
             self.subscribe_enabled = config.subscribeEnabled
+            self.batch_publish = config.batchPublish
             self.write_command_topic = config.writeCommandTopic or "write/command"
             self.write_result_topic = config.writeResultTopic or "write/result"
+            self._topic_handlers = {self.write_command_topic: self._handle_write_command}
 
             logger.info(f"MQTT config loaded: {config.broker}:{config.port}")
             if self.subscribe_enabled:
                 logger.info(f"Override subscription enabled: {OVERRIDE_PATTERN}")
+            if self.batch_publish:
+                logger.info("Grouped publishing enabled: devices/<deviceId>/telemetry")
             return True
 
     def update_mqtt_status(self, status: str, update_data_flow: bool = False):
         """Update MQTT connection status in database."""
+        if self._mqtt_config_id is None:
+            return
+
+        now = datetime.now()
+        values: Dict[str, Any] = {"connectionStatus": status, "updatedAt": now}
+        if update_data_flow and self.mqtt_client:
+            values["lastDataFlow"] = now
+        if status == "connected":
+            values["lastConnected"] = now
+
+        table = MqttConfig.__table__
         try:
-            with Session(self.engine) as session:
-                config = session.exec(select(MqttConfig)).first()
-                if config:
-                    config.connectionStatus = status
-                    config.updatedAt = datetime.now()
-                    if update_data_flow and self.mqtt_client:
-                        config.lastDataFlow = datetime.now()
-                    if status == "connected":
-                        config.lastConnected = datetime.now()
-                    session.add(config)
-                    session.commit()
+            with self.engine.begin() as conn:
+                conn.execute(
+                    update(table).where(table.c.id == self._mqtt_config_id).values(**values)
+                )
         except Exception as e:
             logger.warning(f"Failed to update MQTT status: {e}")
 
-    def get_enabled_points(self) -> List[Dict[str, Any]]:
-        """Fetch enabled points from database."""
-        with Session(self.engine) as session:
-            query = (
-                select(Point, Device)
-                .join(Device, Point.deviceId == Device.id)
-                .where(Point.mqttPublish == True)
-                .where(Point.enabled == True)
-                .where(Device.enabled == True)
-            )
+    def invalidate_points_cache(self):
+        """Force the next get_enabled_points call to re-query the database."""
+        self._points_cache = None
 
-            results = session.exec(query).all()
+    def get_enabled_points(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Fetch enabled points, reusing the cached list for POINTS_CACHE_TTL seconds."""
+        now = time.time()
+        if (
+            not force_refresh
+            and self._points_cache is not None
+            and now - self._points_cache_ts < POINTS_CACHE_TTL
+        ):
+            return self._points_cache
+
+        with self.engine.connect() as conn:
+            results = conn.execute(_ENABLED_POINTS_QUERY).all()
 
             points = []
-            for point, device in results:
+            for row in results:
                 points.append({
-                    "id": point.id,
-                    "objectType": point.objectType,
-                    "objectInstance": point.objectInstance,
-                    "pointName": point.pointName,
-                    "dis": point.dis,
-                    "units": point.units,
-                    "mqttTopic": point.mqttTopic,
-                    "pollInterval": point.pollInterval,
-                    "qos": point.qos,
-                    "haystackPointName": point.haystackPointName,
-                    "isWritable": point.isWritable,
-                    "deviceId": device.deviceId,
-                    "deviceIp": device.ipAddress,
-                    "devicePort": device.port,
+                    "id": row.id,
+                    "objectType": row.objectType,
+                    "objectInstance": row.objectInstance,
+                    "pointName": row.pointName,
+                    "dis": row.dis,
+                    "units": row.units,
+                    "mqttTopic": row.mqttTopic,
+                    "pollInterval": row.pollInterval,
+                    "qos": row.qos,
+                    "haystackPointName": row.haystackPointName,
+                    "isWritable": row.isWritable,
+                    "deviceId": row.deviceId,
+                    "deviceIp": row.ipAddress,
+                    "devicePort": row.port,
+                    "payloadTemplate": point_payload_template(
+                        row.units,
+                        row.dis,
+                        row.haystackPointName,
+                        row.objectType,
+                        row.objectInstance,
+                    ),
                 })
 
             logger.info(f"Loaded {len(points)} enabled points")
+            self._points_cache = points
+            self._points_cache_ts = now
             return points
 
-    def update_point_value(self, point_id: int, value: str, timestamp: datetime):
-        """Update point value in database."""
+    def flush_point_updates(self):
+        """Write all point values collected this cycle in a single transaction."""
+        if not self._pending_point_updates:
+            return
+
+        rows = [
+            {"point_id": point_id, "value": value, "ts": timestamp}
+            for point_id, value, timestamp in self._pending_point_updates
+        ]
+        self._pending_point_updates = []
+
         try:
-            with Session(self.engine) as session:
-                point = session.get(Point, point_id)
-                if point:
-                    point.lastValue = value
-                    point.lastPollTime = timestamp
-                    point.updatedAt = timestamp
-                    session.add(point)
-                    session.commit()
+            with self.engine.begin() as conn:
+                conn.execute(_POINT_VALUE_UPDATE, rows)
         except Exception as e:
-            logger.warning(f"Failed to update point {point_id}: {e}")
+            logger.warning(f"Failed to update {len(rows)} point values: {e}")
 
     def build_topic_to_point_map(self):
         """Build mapping from override topics to point info for fast lookup."""
         self.topic_to_point = {}
-        points = self.get_enabled_points()
+        # Refresh the cache so polling reuses this same list
+        points = self.get_enabled_points(force_refresh=True)
 
         for point in points:
             mqtt_topic = point.get("mqttTopic")
@@ -204,7 +368,7 @@ class PollingWorker:
                 # The override topic uses fixed prefix: override/<mqtt_topic>
                 # e.g., mqtt_topic = "site/ahu/12/sensor/temp/435"
                 # override_topic = "override/site/ahu/12/sensor/temp/435"
-                override_topic = f"{OVERRIDE_PREFIX}/{mqtt_topic}"
+                override_topic = OVERRIDE_PREFIX_SLASH + mqtt_topic
                 self.topic_to_point[override_topic] = point
                 logger.debug(f"Mapped override topic: {override_topic}")
 
@@ -213,13 +377,14 @@ class PollingWorker:
     def handle_mqtt_message(self, topic: str, payload: bytes):
         """Handle incoming MQTT messages for overrides and write commands."""
         try:
-            # Check if this is a write command
-            if topic == self.write_command_topic:
-                self._handle_write_command(payload)
+            # Exact topics (write command) - one dict lookup
+            handler = self._topic_handlers.get(topic)
+            if handler is not None:
+                handler(payload)
                 return
 
             # Check if this is an override message (uses fixed prefix)
-            if topic.startswith(f"{OVERRIDE_PREFIX}/"):
+            if topic.startswith(OVERRIDE_PREFIX_SLASH):
                 self._handle_override_message(topic, payload)
                 return
 
@@ -234,178 +399,270 @@ class PollingWorker:
         logger.info(f"Received write command (handled by WriteHandler)")
 
     def _handle_override_message(self, topic: str, payload: bytes):
-        """Handle override messages - write value to BACnet point."""
+        """Queue a raw override message for the event loop.
+
+        Called from the paho network thread, so it only hands the bytes over;
+        lookup and parsing happen in process_pending_overrides.
+        """
+        message = (topic, payload)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._enqueue_override, message)
+        else:
+            self.pending_overrides.put_nowait(message)
+
+    def _enqueue_override(self, message: Tuple[str, bytes]):
+        """Queue an override message on the event loop and wake the main loop."""
+        self.pending_overrides.put_nowait(message)
+        self._wake_event.set()
+
+    def _parse_override(self, topic: str, payload: bytes) -> Optional[Dict[str, Any]]:
+        """Resolve an override message to {point, value, priority}, or None if rejected."""
         # Find matching point
         point = self.topic_to_point.get(topic)
         if not point:
             logger.warning(f"Override topic not found in map: {topic}")
-            return
+            return None
 
         # Check if point is writable
         if not point.get("isWritable", False):
             logger.warning(
                 f"Override rejected: Point '{point.get('pointName')}' is not writable"
             )
-            return
-
-        try:
-            # Parse payload
-            data = json.loads(payload.decode())
-            value = data.get("value")
-
-            if value is None:
-                logger.warning(f"Override message missing 'value': {topic}")
-                return
-
-            logger.info(f"Override received: {topic} -> {value}")
-
-            # Queue the write for async processing
-            self._queue_override_write(point, value, data.get("priority", 8))
+            return None
 
-        except json.JSONDecodeError:
-            # Try raw value (just a number or string)
+        data = _parse_override_json(payload)
+        if data is None:
+            # Raw value (just a number or string)
             try:
                 value = payload.decode().strip()
-                if value:
-                    logger.info(f"Override received (raw): {topic} -> {value}")
-                    self._queue_override_write(point, value, 8)
             except Exception as e:
                 logger.error(f"Failed to parse override payload: {e}")
+                return None
+            if not value:
+                return None
+            logger.debug("Override received (raw): %s -> %s", topic, value)
+            return {"point": point, "value": value, "priority": 8}
+
+        value = data.get("value")
+        if value is None:
+            logger.warning(f"Override message missing 'value': {topic}")
+            return None
+
+        # BACnet priorities are 1-16; accept "8" / 8.0 as the baseline did
+        try:
+            priority = int(data.get("priority", 8))
+        except (TypeError, ValueError):
+            logger.warning(f"Override message has invalid 'priority': {topic}")
+            return None
+        priority = min(max(priority, 1), 16)
 
-    def _queue_override_write(self, point: Dict[str, Any], value: Any, priority: int):
-        """Queue an override write to be processed."""
-        # Store for async processing
-        if not hasattr(self, 'pending_overrides'):
-            self.pending_overrides: List[Dict] = []
-
-        self.pending_overrides.append({
-            "point": point,
-            "value": value,
-            "priority": priority,
-            "timestamp": datetime.now(pytz.utc),
-        })
+        logger.debug("Override received: %s -> %s", topic, value)
+        return {"point": point, "value": value, "priority": priority}
 
     async def process_pending_overrides(self):
         """Process any pending override writes."""
-        if not hasattr(self, 'pending_overrides') or not self.pending_overrides:
+        if self.pending_overrides.empty():
             return
 
         if not self.bacnet_client:
             return
 
-        while self.pending_overrides:
-            override = self.pending_overrides.pop(0)
-            point = override["point"]
-            value = override["value"]
-            priority = override["priority"]
+        # Drain the queue, keeping only the latest override per point (writes
+        # to one point at once would race on presentValue)
+        latest: Dict[int, Dict[str, Any]] = {}
+        while not self.pending_overrides.empty():
+            override = self._parse_override(*self.pending_overrides.get_nowait())
+            if override is None:
+                continue
+            point_id = override["point"]["id"]
+            latest.pop(point_id, None)
+            latest[point_id] = override
 
-            try:
-                success, error_msg = await self.bacnet_client.write_property(
-                    device_ip=point["deviceIp"],
-                    device_port=point["devicePort"],
-                    object_type=point["objectType"],
-                    object_instance=point["objectInstance"],
-                    value=value,
-                    priority=priority,
-                )
+        # Fire the writes concurrently (the BACnet client limits per device)
+        write_sem = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
 
-                if success:
-                    logger.info(f"Override write successful: {point['pointName']} = {value}")
-                    # Update the point value in DB
-                    self.update_point_value(point["id"], str(value), datetime.now(pytz.utc))
-                else:
-                    logger.error(f"Override write failed: {point['pointName']} - {error_msg}")
+        async def _write(override: Dict[str, Any]):
+            async with write_sem:
+                return await self._write_override(override)
 
-            except Exception as e:
-                logger.error(f"Override write error: {point['pointName']} - {e}")
+        results = await asyncio.gather(*(_write(override) for override in latest.values()))
+
+        # Record written values in one batch
+        self.flush_point_updates()
+
+        if results:
+            written = sum(results)
+            logger.info("Overrides: %d written, %d failed", written, len(results) - written)
+
+    async def _write_override(self, override: Dict[str, Any]) -> bool:
+        """Write a single override to BACnet and queue its DB update on success."""
+        point = override["point"]
+        value = override["value"]
+        priority = override["priority"]
+
+        try:
+            success, error_msg = await self.bacnet_client.write_property(
+                device_ip=point["deviceIp"],
+                device_port=point["devicePort"],
+                object_type=point["objectType"],
+                object_instance=point["objectInstance"],
+                value=value,
+                priority=priority,
+            )
+
+            if success:
+                # Per-write detail at debug; process_pending_overrides logs the batch summary
+                logger.debug("Override write successful: %s = %s", point["pointName"], value)
+                # Update the point value in DB
+                self._pending_point_updates.append((point["id"], str(value), datetime.now(pytz.utc)))
+                return True
+
+            logger.error(f"Override write failed: {point['pointName']} - {error_msg}")
+
+        except Exception as e:
+            logger.error(f"Override write error: {point['pointName']} - {e}")
+
+        return False
+
+    def _build_schedule(self, points: List[Dict[str, Any]]):
+        """Build the min-heap of (next_due_time, point_id) for the point list."""
+        next_minute = math.ceil(time.time() / 60) * 60
+
+        self._schedule_points = {point["id"]: point for point in points}
+        self._schedule = []
+        for point in points:
+            last_poll = self.point_last_poll.get(point["id"])
+            if last_poll is None:
+                # New points start on the next minute boundary
+                next_due = next_minute
+            else:
+                next_due = last_poll + point["pollInterval"]
+            self._schedule.append((next_due, point["id"]))
+
+        heapq.heapify(self._schedule)
+        self._schedule_source = points
 
     async def poll_and_publish(self):
         """Main polling loop - poll points and publish to MQTT."""
         points = self.get_enabled_points()
 
         if not points:
+            # Nothing to schedule - don't leave a stale heap head driving the loop
+            self._schedule = []
+            self._schedule_points = {}
+            self._schedule_source = None
             return
 
+        # Rebuild the schedule whenever the cached point list is refreshed
+        if points is not self._schedule_source:
+            self._build_schedule(points)
+
         current_time = time.time()
         timestamp = datetime.now(pytz.utc)
 
-        # Calculate minute boundary for alignment
-        next_minute = math.ceil(current_time / 60) * 60
-
         # Statistics
-        total_reads = 0
         successful_reads = 0
         failed_reads = 0
-        skipped_reads = 0
         publishes = 0
 
-        # Poll each point
-        for point in points:
-            point_id = point["id"]
+        # Collect the points that are due
+        due: List[Tuple[Dict[str, Any], float]] = []
+        while self._schedule and self._schedule[0][0] <= current_time:
+            due_time, point_id = heapq.heappop(self._schedule)
+            point = self._schedule_points[point_id]
             poll_interval = point["pollInterval"]
 
-            # Initialize new points for minute-aligned polling
-            if point_id not in self.point_last_poll:
-                self.point_last_poll[point_id] = next_minute - poll_interval
-                skipped_reads += 1
-                continue
+            # Next slot on the interval grid, whether or not this read succeeds
+            aligned_time = math.floor(current_time / poll_interval) * poll_interval
+            heapq.heappush(self._schedule, (aligned_time + poll_interval, point_id))
 
-            # Check if time to poll
-            last_poll = self.point_last_poll.get(point_id, 0)
-            if current_time - last_poll < poll_interval:
-                skipped_reads += 1
+            # Missed the alignment window - wait for the next aligned slot
+            if current_time - due_time >= ALIGNMENT_WINDOW:
                 continue
 
-            # Check alignment
-            current_second = int(current_time) % 60
-            if (current_second % poll_interval) >= 2:
-                skipped_reads += 1
+            due.append((point, aligned_time))
+
+        total_reads = len(due)
+
+        # Read all due points from BACnet concurrently
+        read_sem = asyncio.Semaphore(MAX_CONCURRENT_READS)
+
+        async def _read(point: Dict[str, Any]) -> Optional[Any]:
+            async with read_sem:
+                return await self.bacnet_client.read_property(
+                    device_ip=point["deviceIp"],
+                    device_port=point["devicePort"],
+                    object_type=point["objectType"],
+                    object_instance=point["objectInstance"],
+                )
+
+        values = await asyncio.gather(*(_read(point) for point, _ in due))
+
+        # Same for every point published this cycle
+        tz_offset = int(timestamp.astimezone(self.timezone).utcoffset().total_seconds() / 3600)
+        timestamp_iso = format_utc_timestamp(timestamp)
+
+        # Grouped publish mode: point payloads per BACnet device ID, and the
+        # highest QoS configured among each device's points
+        device_batches: Dict[int, List[Dict[str, Any]]] = {}
+        device_batch_qos: Dict[int, int] = {}
+
+        for (point, aligned_time), value in zip(due, values):
+            point_id = point["id"]
+
+            if value is None:
+                failed_reads += 1
                 continue
 
-            total_reads += 1
+            successful_reads += 1
 
-            # Read from BACnet
-            value = await self.bacnet_client.read_property(
-                device_ip=point["deviceIp"],
-                device_port=point["devicePort"],
+            # Update poll time
+            self.point_last_poll[point_id] = aligned_time
+
+            # Queue database update (flushed once per cycle)
+            self._pending_point_updates.append((point_id, str(value), timestamp))
+
+            # Publish to MQTT
+            if not (point["mqttTopic"] and self.mqtt_client and self.mqtt_client.connected):
+                continue
+
+            if self.batch_publish:
+                payload = fill_point_payload(
+                    point["payloadTemplate"], value, timestamp_iso, tz_offset
+                )
+                if payload is not None:
+                    device_id = point["deviceId"]
+                    device_batches.setdefault(device_id, []).append(payload)
+                    device_batch_qos[device_id] = max(device_batch_qos.get(device_id, 0), point["qos"])
+            elif self.mqtt_client.publish_point_value(
+                topic=point["mqttTopic"],
+                value=value,
+                units=point["units"],
+                dis=point["dis"],
+                haystack_name=point["haystackPointName"],
                 object_type=point["objectType"],
                 object_instance=point["objectInstance"],
-            )
-
-            if value is not None:
-                successful_reads += 1
-
-                # Update poll time
-                aligned_time = math.floor(current_time / poll_interval) * poll_interval
-                self.point_last_poll[point_id] = aligned_time
-
-                # Update database
-                self.update_point_value(point_id, str(value), timestamp)
-
-                # Publish to MQTT
-                if point["mqttTopic"] and self.mqtt_client and self.mqtt_client.connected:
-                    tz_offset = int(timestamp.astimezone(self.timezone).utcoffset().total_seconds() / 3600)
-
-                    if self.mqtt_client.publish_point_value(
-                        topic=point["mqttTopic"],
-                        value=value,
-                        units=point["units"],
-                        dis=point["dis"],
-                        haystack_name=point["haystackPointName"],
-                        object_type=point["objectType"],
-                        object_instance=point["objectInstance"],
-                        timezone_offset=tz_offset,
-                        qos=point["qos"],
-                    ):
-                        publishes += 1
-            else:
-                failed_reads += 1
+                timezone_offset=tz_offset,
+                qos=point["qos"],
+                payload_template=point["payloadTemplate"],
+                timestamp=timestamp_iso,
+            ):
+                publishes += 1
+
+        # One message per device in grouped mode
+        for device_id, payloads in device_batches.items():
+            topic = BATCH_TOPIC_FORMAT.format(device_id=device_id)
+            if self.mqtt_client.publish_point_values_batch(topic, payloads, qos=device_batch_qos[device_id]):
+                publishes += len(payloads)
+
+        # Write all values read this cycle in one round-trip
+        self.flush_point_updates()
 
         # Log summary
         if total_reads > 0:
             self.poll_cycle += 1
             logger.info(f"Poll Cycle #{self.poll_cycle}:")
-            logger.info(f"  Points: {len(points)} ({total_reads} polled, {skipped_reads} skipped)")
+            logger.info(f"  Points: {len(points)} ({total_reads} polled, {len(points) - total_reads} skipped)")
             logger.info(f"  Reads: {successful_reads}/{total_reads} successful")
             logger.info(f"  Published: {publishes}")
 
@@ -413,9 +670,61 @@ class PollingWorker:
             if publishes > 0:
                 self.update_mqtt_status("connected", update_data_flow=True)
 
+    async def _sleep_until_next_cycle(self):
+        """Sleep until the next point is due, waking early for queued overrides."""
+        if not self.pending_overrides.empty():
+            return
+
+        if self._schedule:
+            delay = self._schedule[0][0] - time.time()
+        else:
+            delay = MAX_LOOP_SLEEP
+        delay = min(max(delay, MIN_LOOP_SLEEP), MAX_LOOP_SLEEP)
+
+        self._wake_event.clear()
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _check_flags(self) -> Tuple[bool, bool]:
+        """Return (discovery_active, restart_requested), re-checked at most every FLAG_CHECK_INTERVAL."""
+        now = time.time()
+        if now - self._last_flag_check >= FLAG_CHECK_INTERVAL:
+            self._flags_cache = (
+                os.path.exists(DISCOVERY_LOCK_FILE),
+                os.path.exists(RESTART_FLAG_FILE),
+            )
+            self._last_flag_check = now
+        return self._flags_cache
+
+    def _maybe_reconnect_mqtt(self):
+        """Retry the MQTT connection with full-jitter exponential backoff."""
+        now = time.time()
+        if now < self._next_reconnect_at:
+            return
+
+        if self.mqtt_client.reconnect():
+            self._reconnect_attempt = 0
+            self._next_reconnect_at = 0.0
+            self.update_mqtt_status("connected")
+            return
+
+        # delay = random(0, min(cap, base * 2^n)) spreads out gateways
+        # reconnecting after a shared broker outage
+        self._reconnect_attempt += 1
+        ceiling = min(
+            RECONNECT_MAX_DELAY,
+            RECONNECT_BASE_DELAY * 2 ** self._reconnect_attempt,
+        )
+        delay = random.uniform(0, ceiling)
+        self._next_reconnect_at = now + delay
+        logger.info(f"MQTT reconnect attempt {self._reconnect_attempt} failed - next try in {delay:.1f}s")
+
     async def run(self):
         """Main worker loop."""
         logger.info("=== BacPipes Worker Starting ===")
+        self._loop = asyncio.get_running_loop()
 
         # Wait for configuration
         while not self.load_system_settings():
@@ -460,8 +769,10 @@ class PollingWorker:
         # Main loop
         while True:
             try:
+                discovery_active, restart_requested = self._check_flags()
+
                 # Check for discovery lock
-                if os.path.exists(DISCOVERY_LOCK_FILE):
+                if discovery_active:
                     logger.info("Discovery lock detected - pausing polling")
                     self.bacnet_client.close()
                     self.bacnet_client = None
@@ -476,12 +787,22 @@ class PollingWorker:
                         device_id=self.bacnet_device_id,
                     )
                     self.bacnet_client.initialize()
+                    self._last_flag_check = 0.0
+
+                    # Discovery replaces every device and point (new ids)
+                    self.invalidate_points_cache()
+                    self.build_topic_to_point_map()
                     continue
 
                 # Check for restart flag
-                if os.path.exists(RESTART_FLAG_FILE):
+                if restart_requested:
                     logger.info("Restart flag detected - reloading configuration")
-                    os.remove(RESTART_FLAG_FILE)
+                    try:
+                        os.remove(RESTART_FLAG_FILE)
+                    except FileNotFoundError:
+                        pass
+                    self._last_flag_check = 0.0
+                    self.invalidate_points_cache()
 
                     # Reload configs
                     self.load_system_settings()
@@ -506,8 +827,7 @@ class PollingWorker:
 
                 # Reconnect MQTT if needed (don't set "connecting" for periodic retries)
                 if self.mqtt_client and not self.mqtt_client.connected:
-                    if self.mqtt_client.reconnect():
-                        self.update_mqtt_status("connected")
+                    self._maybe_reconnect_mqtt()
 
                 # Process any pending override writes
                 await self.process_pending_overrides()
@@ -517,8 +837,11 @@ class PollingWorker:
 
             except Exception as e:
                 logger.error(f"Error in poll cycle: {e}", exc_info=True)
+                # Back off instead of spinning on a schedule that may be stale
+                await asyncio.sleep(MAX_LOOP_SLEEP)
+                continue
 
-            await asyncio.sleep(1)
+            await self._sleep_until_next_cycle()
 
         # Cleanup
         logger.info("Shutting down...")